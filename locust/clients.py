@@ -42,10 +42,22 @@ class HttpSession(requests.Session):
                            to work as argument to a with statement. This will allow the request to be marked as a fail based on the content of the
                            response, even if the response code is ok (2xx). The opposite also works, one can use catch_response to catch a request
                            and then mark it as successful even if the response code was not (i.e 500 or 404).
+
+    The constructor also takes a *trust_env* argument (default True) which, if set to False, makes requests
+    ignore environment settings such as proxies and .netrc authentication, and a *shared_adapter* argument
+    which is an HTTPAdapter (connection pool) shared with other sessions. The shared adapter is mounted
+    for both http:// and https://, and it's not closed when the session is closed.
     """
 
-    def __init__(self, base_url, request_success, request_failure, *args, **kwargs):
+    def __init__(
+        self, base_url, request_success, request_failure, *args, trust_env=True, shared_adapter=None, **kwargs
+    ):
         super().__init__(*args, **kwargs)
+        self.trust_env = trust_env
+        self.shared_adapter = shared_adapter
+        if shared_adapter is not None:
+            self.mount("http://", shared_adapter)
+            self.mount("https://", shared_adapter)
 
         self.base_url = base_url
         self.request_success = request_success
@@ -65,6 +77,14 @@ class HttpSession(requests.Session):
             # configure requests to use basic auth
             self.auth = HTTPBasicAuth(parsed_url.username, parsed_url.password)
 
+    def close(self):
+        """
+        Close all adapters of the session, except the shared adapter, which other sessions may still be using
+        """
+        for adapter in self.adapters.values():
+            if adapter is not self.shared_adapter:
+                adapter.close()
+
     def _build_url(self, path):
         """ prepend url with hostname unless it's already an absolute URL """
         if absolute_http_url_regexp.match(path):
@@ -311,18 +311,33 @@ class FastHttpUser(User):
             raise LocustError(
                 "You must specify the base host. Either in the host attribute in the User class, or on the command line using the --host option."
             )
-        if not re.match(r"^https?://[^/]+", self.host, re.I):
-            raise LocustError("Invalid host (`%s`), must be a valid base URL. E.g. http://example.com" % self.host)
-
-        self.client = FastHttpSession(
-            self.environment,
-            base_url=self.host,
-            network_timeout=self.network_timeout,
-            connection_timeout=self.connection_timeout,
-            max_redirects=self.max_redirects,
-            max_retries=self.max_retries,
-            insecure=self.insecure,
-        )
+        validate_host(self.host)
+
+        self.client = create_fast_http_session(self)
+
+
+def validate_host(host):
+    """Raise a LocustError if *host* isn't a valid base URL for FastHttpSession"""
+    if not re.match(r"^https?://[^/]+", host, re.I):
+        raise LocustError("Invalid host (`%s`), must be a valid base URL. E.g. http://example.com" % host)
+
+
+def create_fast_http_session(user):
+    """
+    Create a FastHttpSession for *user*, configured by the UserAgent settings of the user
+    (network_timeout, connection_timeout, max_redirects, max_retries and insecure). Users that
+    aren't FastHttpUsers (i.e. an HttpUser with use_fast_http set) get FastHttpUser's defaults
+    for any of these settings they don't define.
+    """
+    return FastHttpSession(
+        user.environment,
+        base_url=user.host,
+        network_timeout=getattr(user, "network_timeout", FastHttpUser.network_timeout),
+        connection_timeout=getattr(user, "connection_timeout", FastHttpUser.connection_timeout),
+        max_redirects=getattr(user, "max_redirects", FastHttpUser.max_redirects),
+        max_retries=getattr(user, "max_retries", FastHttpUser.max_retries),
+        insecure=getattr(user, "insecure", FastHttpUser.insecure),
+    )
 
 
 class FastResponse(CompatResponse):
@@ -92,6 +92,8 @@ class Environment:
         self.stop_timeout = stop_timeout
         self.catch_exceptions = catch_exceptions
         self.parsed_options = parsed_options
+        # connection pool shared by HttpUsers that have share_connection_pool set (created on first use)
+        self._shared_http_adapter = None
 
         self._filter_tasks_by_tags()
 
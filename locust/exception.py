@@ -14,6 +14,15 @@ class MissingWaitTimeError(LocustError):
     pass
 
 
+class MissingClientError(LocustError, AttributeError):
+    """
+    Raised when accessing the client of a User that doesn't have one. It's also an AttributeError,
+    so that hasattr() and getattr() with a default keep working.
+    """
+
+    pass
+
+
 class InterruptTaskSet(Exception):
     """
     Exception that will interrupt a User when thrown inside a task
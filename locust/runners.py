@@ -355,8 +355,14 @@ class Runner:
         Stop any running load test and kill all greenlets for the runner
         """
         self.stop()
+        self._close_shared_http_adapter()
         self.greenlet.kill(block=True)
 
+    def _close_shared_http_adapter(self):
+        if self.environment._shared_http_adapter is not None:
+            self.environment._shared_http_adapter.close()
+            self.environment._shared_http_adapter = None
+
     def log_exception(self, node_id, msg, formatted_tb):
         key = hash(formatted_tb)
         row = self.exceptions.setdefault(key, {"count": 0, "msg": msg, "traceback": formatted_tb, "nodes": set()})
@@ -794,6 +800,7 @@ class WorkerRunner(DistributedRunner):
                 logger.info("Got quit message from master, shutting down...")
                 self.stop()
                 self._send_stats()  # send a final report, in case there were any samples not yet reported
+                self._close_shared_http_adapter()
                 self.greenlet.kill(block=True)
 
     def stats_reporter(self):
@@ -22,6 +22,17 @@ class TestHttpSession(WebserverTestCase):
         r = s.get("/ultra_fast")
         self.assertEqual(200, r.status_code)
 
+    def test_trust_env(self):
+        self.assertTrue(self.get_client().trust_env)
+        s = HttpSession(
+            base_url="http://127.0.0.1:%i" % self.port,
+            request_success=self.environment.events.request_success,
+            request_failure=self.environment.events.request_failure,
+            trust_env=False,
+        )
+        self.assertFalse(s.trust_env)
+        self.assertEqual(200, s.get("/ultra_fast").status_code)
+
     def test_connection_error(self):
         s = self.get_client(base_url="http://localhost:1")
         r = s.get("/", timeout=0.1)
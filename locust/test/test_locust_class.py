@@ -4,7 +4,9 @@ from gevent.pool import Group
 
 from locust.exception import InterruptTaskSet, ResponseError
 from locust import HttpUser, User, TaskSet, task, constant
+from locust.clients import HttpSession
 from locust.env import Environment
+from locust.user.task import ALIAS_METHOD_MIN_TASKS, DefaultTaskSet, get_alias_table, get_tasks_from_base_classes
 from locust.exception import CatchResponseError, LocustError, RescheduleTask, RescheduleTaskImmediately, StopUser
 
 from .testcases import LocustTestCase, WebserverTestCase
@@ -47,6 +49,37 @@ class TestTaskSet(LocustTestCase):
         l.tasks = []
         self.assertRaisesRegex(Exception, "No tasks defined on MyTasks.*", l.run)
 
+    def test_tasks_set_on_user_instance(self):
+        class MyUser(User):
+            @task
+            def t1(self):
+                pass
+
+            @task
+            def t2(self):
+                pass
+
+        l = MyUser(self.environment)
+        l.tasks = [MyUser.t2]
+        taskset = DefaultTaskSet(l)
+        self.assertEqual({MyUser.t2}, set(taskset.get_next_task() for _ in range(20)))
+
+    def test_tasks_modified_in_place(self):
+        class MyUser(User):
+            @task
+            def t1(self):
+                pass
+
+            @task
+            def t2(self):
+                pass
+
+        l = MyUser(self.environment)
+        taskset = DefaultTaskSet(l)
+        MyUser.tasks.remove(MyUser.t1)
+        self.assertEqual({MyUser.t2}, set(taskset.get_next_task() for _ in range(20)))
+        self.assertEqual((MyUser.t2,), MyUser._tasks)
+
     def test_tasks_missing_from_user_gives_user_friendly_exception(self):
         class MyUser(User):
             wait_time = constant(0.5)
@@ -113,6 +146,66 @@ class TestTaskSet(LocustTestCase):
         self.assertEqual(2, len([t for t in l.tasks if t.__name__ == MyUser.t1.__name__]))
         self.assertEqual(3, len([t for t in l.tasks if t.__name__ == MyUser.t2.__name__]))
 
+    def test_task_weights_on_locust(self):
+        class MyUser(User):
+            @task(2)
+            def t1(self):
+                pass
+
+            @task(3)
+            def t2(self):
+                pass
+
+        self.assertEqual((MyUser.t1, MyUser.t2), MyUser._tasks)
+        self.assertEqual((2, 5), MyUser._cum_weights)
+        picked = set(MyUser._pick_task() for _ in range(100))
+        self.assertEqual({MyUser.t1, MyUser.t2}, picked)
+
+        MyUser.tasks = [MyUser.t2]
+        self.assertEqual((MyUser.t2,), MyUser._tasks)
+        self.assertEqual((1,), MyUser._cum_weights)
+        self.assertEqual(MyUser.t2, MyUser(self.environment)._pick_task())
+
+    def test_alias_table(self):
+        weights = [1, 7, 3, 1, 20, 2, 5]
+        prob, alias = get_alias_table(weights)
+        n = len(weights)
+        for i, weight in enumerate(weights):
+            p = prob[i] + sum(1 - prob[j] for j in range(n) if alias[j] == i and j != i)
+            self.assertAlmostEqual(weight / sum(weights), p / n)
+
+    def test_task_picker_with_many_tasks(self):
+        tasks = [(lambda l, i=i: i, i + 1) for i in range(ALIAS_METHOD_MIN_TASKS)]
+
+        class MyUser(User):
+            pass
+
+        MyUser.tasks = get_tasks_from_base_classes([], {"tasks": tasks})
+        picked = set(MyUser._pick_task() for _ in range(2000))
+        self.assertTrue(picked <= set(MyUser._tasks))
+        self.assertIn(MyUser._tasks[-1], picked)
+
+    def test_client_missing_gives_user_friendly_exception(self):
+        class MyUser(User):
+            pass
+
+        l = MyUser(self.environment)
+        self.assertRaisesRegex(LocustError, "No client instantiated.*", lambda: l.client)
+        self.assertFalse(hasattr(l, "client"))
+        self.assertIsNone(getattr(l, "client", None))
+
+    def test_user_with_slotted_mixin(self):
+        class SlottedMixin:
+            __slots__ = ("foo",)
+
+        class MyUser(SlottedMixin, User):
+            pass
+
+        l = MyUser(self.environment)
+        l.foo = 1
+        self.assertEqual(1, l.foo)
+        self.assertIs(self.environment, l.environment)
+
     def test_taskset_on_abstract_locust(self):
         v = [0]
 
@@ -614,6 +707,86 @@ class TestWebLocustClass(WebserverTestCase):
         t1(my_locust)
         self.assertEqual(self.response.text, "This is an ultra fast response")
 
+    def test_client_created_on_first_access(self):
+        class MyUser(HttpUser):
+            host = "http://127.0.0.1:%i" % self.port
+
+        locust = MyUser(self.environment)
+        self.assertNotIn("client", locust.__dict__)
+        client = locust.client
+        self.assertIsInstance(client, HttpSession)
+        self.assertIs(client, locust.client)
+
+    def test_client_connection_pool_not_shared_by_default(self):
+        class MyUser(HttpUser):
+            host = "http://127.0.0.1:%i" % self.port
+
+        user1 = MyUser(self.environment)
+        user2 = MyUser(self.environment)
+        self.assertIsNot(user1.client.get_adapter(user1.host), user2.client.get_adapter(user2.host))
+        self.assertIsNone(self.environment._shared_http_adapter)
+
+    def test_client_connection_pool_shared_between_users(self):
+        class MyUser(HttpUser):
+            host = "http://127.0.0.1:%i" % self.port
+            share_connection_pool = True
+            connection_pool_size = 10
+
+        user1 = MyUser(self.environment)
+        user2 = MyUser(self.environment)
+        self.assertIsNot(user1.client, user2.client)
+        self.assertIs(user1.client.get_adapter(user1.host), user2.client.get_adapter(user2.host))
+        self.assertEqual("GET", user1.client.get("/request_method").text)
+        self.assertEqual("GET", user2.client.get("/request_method").text)
+
+        # closing one user's session must not close the connection pool used by the others
+        user1.client.close()
+        self.assertIs(self.environment._shared_http_adapter, user2.client.get_adapter(user2.host))
+        self.assertTrue(self.environment._shared_http_adapter.poolmanager.pools)
+        self.assertEqual("GET", user2.client.get("/request_method").text)
+        self.assertEqual(10, self.environment._shared_http_adapter._pool_maxsize)
+
+        # the shared pool is closed when the runner quits
+        adapter = self.environment._shared_http_adapter
+        self.runner.quit()
+        self.assertFalse(adapter.poolmanager.pools)
+        self.assertIsNone(self.environment._shared_http_adapter)
+
+    def test_use_fast_http(self):
+        from locust.contrib.fasthttp import FastHttpSession
+
+        class MyUser(HttpUser):
+            host = "http://127.0.0.1:%i" % self.port
+            use_fast_http = True
+
+        locust = MyUser(self.environment)
+        self.assertIsInstance(locust.client, FastHttpSession)
+        self.assertEqual("GET", locust.client.get("/request_method").text)
+        self.assertEqual(1, self.runner.stats.get("/request_method", "GET").num_requests)
+        # configured like a FastHttpUser
+        self.assertEqual(1, locust.client.client.max_retries)
+        self.assertEqual(5, locust.client.client.max_redirects)
+
+        class MyUserWithSettings(MyUser):
+            max_retries = 2
+
+        self.assertEqual(2, MyUserWithSettings(self.environment).client.client.max_retries)
+
+        class InvalidHostUser(MyUser):
+            host = "127.0.0.1"
+
+        self.assertRaisesRegex(LocustError, "Invalid host.*", lambda: InvalidHostUser(self.environment))
+
+    def test_client_on_slotted_http_user(self):
+        class MyUser(HttpUser):
+            __slots__ = ()
+            host = "http://127.0.0.1:%i" % self.port
+
+        locust = MyUser(self.environment)
+        self.assertIsInstance(locust.client, HttpSession)
+        self.assertIs(locust.client, locust.client)
+        self.assertEqual("GET", locust.client.get("/request_method").text)
+
     def test_client_request_headers(self):
         class MyUser(HttpUser):
             host = "http://127.0.0.1:%i" % self.port
@@ -1,7 +1,9 @@
+import bisect
 import logging
 import random
 import sys
 import traceback
+from itertools import accumulate
 from time import time
 from typing import Any, Callable, List, Union
 
@@ -13,7 +15,10 @@ from locust.exception import InterruptTaskSet, RescheduleTask, RescheduleTaskImm
 
 logger = logging.getLogger(__name__)
 
-LOCUST_STATE_RUNNING, LOCUST_STATE_WAITING, LOCUST_STATE_STOPPING = ["running", "waiting", "stopping"]
+LOCUST_STATE_WAITING, LOCUST_STATE_RUNNING, LOCUST_STATE_STOPPING = 1, 2, 3
+
+# Number of (unique) tasks from which tasks are picked using the alias method instead of a binary search
+ALIAS_METHOD_MIN_TASKS = 16
 
 
 def task(weight=1):
@@ -124,6 +129,70 @@ def get_tasks_from_base_classes(bases, class_dict):
     return new_tasks
 
 
+def get_task_weights(tasks):
+    """
+    Collapse a list of tasks, in which each task is repeated according to its weight, into a tuple
+    of unique tasks and a tuple of their cumulative weights (suitable for random.choices)
+    """
+    weights = {}
+    for task in tasks:
+        weights[task] = weights.get(task, 0) + 1
+    return tuple(weights), tuple(accumulate(weights.values()))
+
+
+def get_alias_table(weights):
+    """
+    Build the probability and alias tables for Walker's alias method (using Vose's algorithm),
+    which makes it possible to pick a weighted random index in constant time
+    """
+    n = len(weights)
+    total = sum(weights)
+    scaled = [weight * n / total for weight in weights]
+    prob = [1.0] * n
+    alias = list(range(n))
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        s = small.pop()
+        l = large.pop()
+        prob[s] = scaled[s]
+        alias[s] = l
+        scaled[l] = scaled[l] + scaled[s] - 1.0
+        if scaled[l] < 1.0:
+            small.append(l)
+        else:
+            large.append(l)
+    # any indexes left (because of floating point rounding) keep prob 1.0 and alias to themselves
+    return prob, alias
+
+
+def get_task_picker(tasks, cum_weights):
+    """
+    Return a function that picks a random task from *tasks*, weighted according to *cum_weights*.
+
+    For a small number of tasks each pick is a single random() call and a binary search over the
+    cumulative weights. For many tasks, alias tables are built once so that each pick takes
+    constant time.
+    """
+    total = cum_weights[-1] if cum_weights else 0
+
+    if len(tasks) < ALIAS_METHOD_MIN_TASKS:
+
+        def pick_task(_random=random.random, _bisect=bisect.bisect):
+            return tasks[_bisect(cum_weights, _random() * total)]
+
+    else:
+        weights = [cum_weights[0]] + [b - a for a, b in zip(cum_weights, cum_weights[1:])]
+        prob, alias = get_alias_table(weights)
+        n = len(tasks)
+
+        def pick_task(_random=random.random):
+            i = int(_random() * n)
+            return tasks[i] if _random() < prob[i] else tasks[alias[i]]
+
+    return pick_task
+
+
 def filter_tasks_by_tags(task_holder, tags=None, exclude_tags=None, checked=None):
     """
     Function used by Environment to recursively remove any tasks/TaskSets from a TaskSet/User that
@@ -279,13 +348,14 @@ class TaskSet(object, metaclass=TaskSetMeta):
             else:
                 raise RescheduleTask(e.reschedule).with_traceback(e.__traceback__)
 
+        user = self.user
         while True:
             try:
                 if not self._task_queue:
                     self.schedule_task(self.get_next_task())
 
                 try:
-                    if self.user._state == LOCUST_STATE_STOPPING:
+                    if user._state == LOCUST_STATE_STOPPING:
                         raise StopUser()
                     self.execute_next_task()
                 except RescheduleTaskImmediately:
@@ -378,13 +448,14 @@ class TaskSet(object, metaclass=TaskSetMeta):
         set a stop_timeout. If this behaviour is not desired you should make the user wait using
         gevent.sleep() instead.
         """
-        if self.user._state == LOCUST_STATE_STOPPING:
+        user = self.user
+        if user._state == LOCUST_STATE_STOPPING:
             raise StopUser()
-        self.user._state = LOCUST_STATE_WAITING
+        user._state = LOCUST_STATE_WAITING
         self._sleep(self.wait_time())
-        if self.user._state == LOCUST_STATE_STOPPING:
+        if user._state == LOCUST_STATE_STOPPING:
             raise StopUser()
-        self.user._state = LOCUST_STATE_RUNNING
+        user._state = LOCUST_STATE_RUNNING
 
     def _sleep(self, seconds):
         gevent.sleep(seconds)
@@ -413,11 +484,19 @@ class DefaultTaskSet(TaskSet):
     """
 
     def get_next_task(self):
-        if not self.user.tasks:
+        user = self.user
+        tasks = user.tasks
+        if not tasks:
             raise Exception(
-                f"No tasks defined on {self.user.__class__.__name__}. use the @task decorator or set the tasks property of the User (or mark it as abstract = True if you only intend to subclass it)"
+                f"No tasks defined on {user.__class__.__name__}. use the @task decorator or set the tasks property of the User (or mark it as abstract = True if you only intend to subclass it)"
             )
-        return random.choice(self.user.tasks)
+        if "tasks" in getattr(user, "__dict__", ()):
+            # tasks have been set on the User instance, so the picker built for the class doesn't apply
+            return random.choice(tasks)
+        if tasks != user._tasks_snapshot:
+            # the tasks list has been modified in place since the picker was built
+            type(user)._update_task_picker()
+        return user._pick_task()
 
     def execute_task(self, task):
         if hasattr(task, "tasks") and issubclass(task, TaskSet):
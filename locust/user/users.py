@@ -1,19 +1,46 @@
 from locust.user.wait_time import constant
-from typing import Any, Callable, List, TypeVar, Union
+from typing import TYPE_CHECKING, Any, Callable, List, TypeVar, Union
 from gevent import GreenletExit, greenlet
 from gevent.pool import Group
+from requests.adapters import HTTPAdapter
 from locust.clients import HttpSession
-from locust.exception import LocustError, StopUser
+from locust.exception import LocustError, MissingClientError, StopUser
 from locust.util import deprecation
 from .task import (
     TaskSet,
     DefaultTaskSet,
     get_tasks_from_base_classes,
+    get_task_weights,
+    get_task_picker,
     LOCUST_STATE_RUNNING,
     LOCUST_STATE_WAITING,
     LOCUST_STATE_STOPPING,
 )
 
+if TYPE_CHECKING:
+    from locust.contrib.fasthttp import FastHttpSession
+
+
+def _run_user(user):
+    """
+    Main function for User greenlet. It's important that this function takes the user
+    instance as an argument, since we use greenlet_instance.args[0] to retrieve a reference to the
+    User instance.
+    """
+    user.run()
+
+
+class _NoClient:
+    """
+    Descriptor used as the client of Users that don't define one, which raises an error
+    explaining why instead of silently returning None.
+    """
+
+    def __get__(self, user, owner=None):
+        if user is None:
+            return self
+        raise MissingClientError("No client instantiated. Did you intend to inherit from HttpUser (or FastHttpUser)?")
+
 
 class UserMeta(type):
     """
@@ -30,9 +57,28 @@ class UserMeta(type):
             # Not a base class
             class_dict["abstract"] = False
 
-        deprecation.check_for_deprecated_task_set_attribute(class_dict)
+        if "task_set" in class_dict:
+            deprecation.check_for_deprecated_task_set_attribute(class_dict)
+
+        cls = type.__new__(mcs, classname, bases, class_dict)
+        cls._update_task_picker()
+        return cls
+
+    def __setattr__(cls, name, value):
+        super().__setattr__(name, value)
+        if name == "tasks":
+            # keep the picker in sync when tasks are replaced (e.g. when filtering by tags)
+            cls._update_task_picker()
 
-        return type.__new__(mcs, classname, bases, class_dict)
+    def _update_task_picker(cls):
+        """
+        Build the unique tasks, their cumulative weights and the picker used by DefaultTaskSet when
+        picking the next task. A copy of the tasks list is kept, so that in place changes to it can be detected.
+        """
+        tasks = cls.tasks or []
+        cls._tasks_snapshot = list(tasks)
+        cls._tasks, cls._cum_weights = get_task_weights(tasks)
+        cls._pick_task = staticmethod(get_task_picker(cls._tasks, cls._cum_weights))
 
 
 class User(object, metaclass=UserMeta):
@@ -102,7 +148,7 @@ class User(object, metaclass=UserMeta):
     environment = None
     """A reference to the :py:attr:`environment <locust.Environment>` in which this locust is running"""
 
-    client = None
+    client = _NoClient()
     _state = None
     _greenlet: greenlet.Greenlet = None
     _group: Group
@@ -156,16 +202,7 @@ class User(object, metaclass=UserMeta):
         :type gevent_group: gevent.pool.Group
         :returns: The spawned greenlet.
         """
-
-        def run_user(user):
-            """
-            Main function for User greenlet. It's important that this function takes the user
-            instance as an argument, since we use greenlet_instance.args[0] to retrieve a reference to the
-            User instance.
-            """
-            user.run()
-
-        self._greenlet = group.spawn(run_user, self)
+        self._greenlet = group.spawn(_run_user, self)
         self._group = group
         return self._greenlet
 
@@ -178,14 +215,50 @@ class User(object, metaclass=UserMeta):
                       methods are called. If force is True the greenlet will be killed immediately.
         :returns: True if the greenlet was killed immediately, otherwise False
         """
-        if force or self._state == LOCUST_STATE_WAITING:
+        state = self._state
+        if force or state == LOCUST_STATE_WAITING:
             self._group.killone(self._greenlet)
             return True
-        elif self._state == LOCUST_STATE_RUNNING:
+        elif state == LOCUST_STATE_RUNNING:
             self._state = LOCUST_STATE_STOPPING
             return False
 
 
+class _LazyClient:
+    """
+    Descriptor that creates the HttpSession of an HttpUser the first time its client is accessed,
+    so that users that never make a request don't pay for setting one up.
+    """
+
+    def __get__(self, user, owner=None):
+        if user is None:
+            return self
+        if user.use_fast_http:
+            # imported here since locust.contrib.fasthttp depends on this module
+            from locust.contrib.fasthttp import create_fast_http_session
+
+            session = create_fast_http_session(user)
+        else:
+            environment = user.environment
+            shared_adapter = None
+            if user.share_connection_pool:
+                if environment._shared_http_adapter is None:
+                    environment._shared_http_adapter = HTTPAdapter(
+                        pool_connections=128, pool_maxsize=user.connection_pool_size, pool_block=False
+                    )
+                shared_adapter = environment._shared_http_adapter
+            session = HttpSession(
+                base_url=user.host,
+                request_success=environment.events.request_success,
+                request_failure=environment.events.request_failure,
+                trust_env=False,
+                shared_adapter=shared_adapter,
+            )
+        # store the session on the instance, so that subsequent lookups don't go through the descriptor
+        user.__dict__["client"] = session
+        return session
+
+
 class HttpUser(User):
     """
     Represents an HTTP "user" which is to be spawned and attack the system that is to be load tested.
@@ -194,30 +267,53 @@ class HttpUser(User):
     class by using the :py:func:`@task decorator <locust.task>` on methods, or by setting
     the :py:attr:`tasks attribute <locust.User.tasks>`.
 
-    This class creates a *client* attribute on instantiation which is an HTTP client with support
+    This class creates a *client* attribute on first access which is an HTTP client with support
     for keeping a user session between requests.
     """
 
     abstract = True
     """If abstract is True, the class is meant to be subclassed, and users will not choose this locust during a test"""
 
-    client: HttpSession = None
+    client: Union[HttpSession, "FastHttpSession"] = _LazyClient()
     """
-    Instance of HttpSession that is created upon instantiation of Locust.
+    Instance of HttpSession (or FastHttpSession, if :py:attr:`use_fast_http <locust.HttpUser.use_fast_http>`
+    is set) that is created the first time it's accessed.
     The client supports cookies, and therefore keeps the session between HTTP requests.
     """
 
+    share_connection_pool: bool = False
+    """
+    If True, the clients of all users (with share_connection_pool set) in the same environment share a single
+    connection pool, instead of each user keeping its own connections. This reduces the number of open sockets,
+    but it also means that the system under test sees at most :py:attr:`connection_pool_size` connections
+    per host instead of one (or more) per user, which matters for e.g. connection bound authentication or
+    sticky load balancing. The shared pool is closed when the runner quits.
+    """
+
+    connection_pool_size: int = 1024
+    """
+    Maximum number of connections per host kept in the shared connection pool (see :py:attr:`share_connection_pool`).
+    Should be at least the number of users that make requests concurrently. The pool is created by the first user
+    that needs it, so its size is taken from that user's class.
+    """
+
+    use_fast_http: bool = False
+    """
+    If True, the client will be a geventhttpclient based
+    :py:class:`FastHttpSession <locust.contrib.fasthttp.FastHttpSession>` instead of a python-requests
+    based HttpSession. It's configured the same way as for
+    :py:class:`FastHttpUser <locust.contrib.fasthttp.FastHttpUser>` (network_timeout, connection_timeout,
+    max_redirects, max_retries and insecure can be set on the class). Note that FastHttpSession has a
+    slightly different API, so it may not work as a drop-in replacement.
+    """
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         if self.host is None:
             raise LocustError(
                 "You must specify the base host. Either in the host attribute in the User class, or on the command line using the --host option."
             )
+        if self.use_fast_http:
+            from locust.contrib.fasthttp import validate_host
 
-        session = HttpSession(
-            base_url=self.host,
-            request_success=self.environment.events.request_success,
-            request_failure=self.environment.events.request_failure,
-        )
-        session.trust_env = False
-        self.client = session
+            validate_host(self.host)